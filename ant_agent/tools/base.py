@@ -9,7 +9,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, Type, Union
 
 from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation
 
 
 class AntToolResult(BaseModel):
@@ -18,7 +18,8 @@ class AntToolResult(BaseModel):
     success: bool
     output: Optional[str] = None
     error: Optional[str] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    # Tools build metadata as fresh plain dicts, so it is stored as passed instead of validated and copied
+    metadata: SkipValidation[Dict[str, Any]] = Field(default_factory=dict)
 
 
 class AntTool(BaseTool, ABC):
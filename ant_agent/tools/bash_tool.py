@@ -7,7 +7,6 @@ from __future__ import annotations
 
 import asyncio
 import os
-import shlex
 import subprocess
 from typing import Any, Dict, Optional, Type
 
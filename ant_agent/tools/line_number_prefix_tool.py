@@ -7,7 +7,6 @@ from __future__ import annotations
 
 import os
 import tempfile
-import time
 import shutil
 from typing import Any, Optional, Type
 
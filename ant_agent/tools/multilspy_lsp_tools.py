@@ -8,16 +8,23 @@ Provides multi-language LSP support based on the multilspy library
 
 import logging
 import ast
+import os
+import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Type, Union
+from typing import Dict, List, Optional, Any, Tuple, Type, Union
 from ant_agent.tools.base import AntTool, AntToolResult
 from multilspy import SyncLanguageServer
 from multilspy.multilspy_config import MultilspyConfig
 from multilspy.multilspy_logger import MultilspyLogger
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 logger = logging.getLogger(__name__)
 
+# Negative-result cache settings for declaration lookups
+_NEG_CACHE_TTL = 30.0  # seconds
+_NEG_CACHE_MAX_SIZE = 256
+
 # Tool state manager
 class ToolState:
     """Helper class for managing tool state"""
@@ -291,7 +298,6 @@ Returns:
                     logger.warning(f"{error_detail}, Attempting retry #{retry_count + 1}")
                     retry_count += 1
                     # Wait briefly before retry
-                    import time
                     time.sleep(0.5 * (retry_count + 1))  # Increasing wait time
                     continue
                 else:
@@ -324,7 +330,6 @@ Returns:
                     logger.warning(f"Attempting retry #{retry_count + 1}")
                     retry_count += 1
                     # Wait briefly before retry
-                    import time
                     time.sleep(0.5 * (retry_count + 1))
                     continue
                 else:
@@ -475,7 +480,6 @@ Returns:
                     logger.warning(f"{error_detail}, Attempting retry #{retry_count + 1}")
                     retry_count += 1
                     # Wait briefly before retry
-                    import time
                     time.sleep(0.5 * (retry_count + 1))  # Increasing wait time
                     continue
                 else:
@@ -508,7 +512,6 @@ Returns:
                     logger.warning(f"Attempting retry #{retry_count + 1}")
                     retry_count += 1
                     # Wait briefly before retry
-                    import time
                     time.sleep(0.5 * (retry_count + 1))
                     continue
                 else:
@@ -529,6 +532,8 @@ class MultilspyDeclarationTool(AntTool):
     args_schema: Type[BaseModel] = LSPPositionInput
     language: str
     workspace_path: str
+    # (absolute_path, line, character, mtime_ns) -> expiry time of a "no declaration found" result
+    _neg_cache: Dict[Tuple[str, int, int, int], float] = PrivateAttr(default_factory=dict)
 
     def __init__(self, language: str, workspace_path: str, **kwargs):
         # Set language and workspace_path before calling super().__init__ to pass Pydantic validation
@@ -602,11 +607,46 @@ Returns:
             logger.error(f"Failed to start {self.language} LSP server: {e}")
             raise RuntimeError(f"Cannot start {self.language} LSP server: {e}")
 
+    def _neg_cache_key(self, file_path: str, line: int, character: int) -> Optional[Tuple[str, int, int, int]]:
+        """Build negative cache key, None if the file cannot be stat'ed"""
+        absolute_path = self._get_absolute_path(file_path)
+        try:
+            mtime_ns = os.stat(absolute_path).st_mtime_ns
+        except OSError:
+            return None
+        return (absolute_path, line, character, mtime_ns)
+
+    def _is_cached_miss(self, key: Tuple[str, int, int, int]) -> bool:
+        """Check whether the position recently returned no declaration"""
+        expires_at = self._neg_cache.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._neg_cache[key]
+            return False
+        return True
+
+    def _remember_miss(self, key: Tuple[str, int, int, int]) -> None:
+        """Record a "no declaration found" result, evicting the oldest entry when full"""
+        if len(self._neg_cache) >= _NEG_CACHE_MAX_SIZE:
+            # Dicts preserve insertion order, so the first key is the oldest entry
+            del self._neg_cache[next(iter(self._neg_cache))]
+        self._neg_cache[key] = time.monotonic() + _NEG_CACHE_TTL
+
     def _run(self, file_path: str, line: int, character: int) -> AntToolResult:
         """Find declaration"""
         max_retries = 3
         retry_count = 0
 
+        # Repeated misses at an unchanged position skip the LSP round-trips
+        neg_key = self._neg_cache_key(file_path, line, character)
+        if neg_key is not None and self._is_cached_miss(neg_key):
+            return AntToolResult(
+                success=False,
+                error=f"At {file_path}:{line}:{character} No declaration found",
+                metadata={'cached': True, 'suggestion': 'Try using go_to_definition tool, or check if position is correct'}
+            )
+
         while retry_count < max_retries:
             try:
                 self.start_lsp_server()
@@ -644,6 +684,8 @@ Returns:
                                 retry_count += 1
                                 continue
                             else:
+                                if neg_key is not None:
+                                    self._remember_miss(neg_key)
                                 return AntToolResult(
                                     success=False,
                                     error=error_detail,
@@ -679,7 +721,6 @@ Returns:
                             logger.warning(f"{error_detail}, Attempting retry #{retry_count + 1}")
                             retry_count += 1
                             # Wait briefly before retry
-                            import time
                             time.sleep(0.5 * (retry_count + 1))  # Increasing wait time
                             continue
                         else:
@@ -712,7 +753,6 @@ Returns:
                             logger.warning(f"Attempting retry #{retry_count + 1}")
                             retry_count += 1
                             # Wait briefly before retry
-                            import time
                             time.sleep(0.5 * (retry_count + 1))
                             continue
                         else:
@@ -729,7 +769,6 @@ Returns:
                     logger.warning(f"{error_detail}, Attempting retry #{retry_count + 1}")
                     retry_count += 1
                     # Wait briefly before retry
-                    import time
                     time.sleep(0.5 * (retry_count + 1))  # Increasing wait time
                     continue
                 else:
@@ -762,7 +801,6 @@ Returns:
                     logger.warning(f"Attempting retry #{retry_count + 1}")
                     retry_count += 1
                     # Wait briefly before retry
-                    import time
                     time.sleep(0.5 * (retry_count + 1))
                     continue
                 else:
@@ -900,6 +938,35 @@ def set_tool_context(tool_name: str, server, language) -> None:
     pass
 
 
+# Sentinels for missing definition details, compared by identity in the formatter
+_UNKNOWN_PATH = sys.intern("Unknown path")
+_UNKNOWN_LOCATION = sys.intern("Unknown location")
+_UNKNOWN_LANGUAGE = sys.intern("Unknown language")
+
+# File extension -> language name, used to annotate definition results
+_EXT_LANGUAGE_MAP = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".java": "Java",
+    ".kt": "Kotlin",
+    ".cs": "C#",
+    ".cpp": "C++",
+    ".c": "C",
+    ".rs": "Rust",
+    ".go": "Go",
+    ".rb": "Ruby",
+    ".dart": "Dart",
+    ".sol": "Solidity",
+    ".php": "PHP",
+    ".swift": "Swift",
+    ".scala": "Scala",
+    ".r": "R",
+    ".m": "Objective-C",
+    ".mm": "Objective-C++"
+}
+
+
 def parse_lsp_definition_result(definition_output: str) -> Dict[str, Any]:
     """
     Parse LSP definition request return result
@@ -980,78 +1047,57 @@ def parse_lsp_definition_result(definition_output: str) -> Dict[str, Any]:
                     logger.warning(f"Definition item {i} Is not dict format, skipping")
                     continue
                 
-                # Extract definition information
-                definition_info = {
-                    "index": i + 1,
-                    "file_path": location.get("relativePath") or location.get("absolutePath", "Unknown path"),
-                    "absolute_path": location.get("absolutePath", ""),
-                    "relative_path": location.get("relativePath", ""),
-                    "uri": location.get("uri", ""),
-                    "range": None,
-                    "start_position": None,
-                    "end_position": None
-                }
-                
-                # Handle range information
+                # Extract range information
                 range_info = location.get("range")
+                start_position = end_position = None
                 if isinstance(range_info, dict):
-                    definition_info["range"] = range_info
-                    
-                    # Extract start position
                     start_pos = range_info.get("start")
                     if isinstance(start_pos, dict):
-                        definition_info["start_position"] = {
+                        start_position = {
                             "line": start_pos.get("line", -1) + 1,  # Convert to 1-based index
                             "character": start_pos.get("character", -1) + 1
                         }
-                    
-                    # Extract end position
                     end_pos = range_info.get("end")
                     if isinstance(end_pos, dict):
-                        definition_info["end_position"] = {
+                        end_position = {
                             "line": end_pos.get("line", -1) + 1,  # Convert to 1-based index
                             "character": end_pos.get("character", -1) + 1
                         }
-                
+                else:
+                    range_info = None
+
                 # Generate location description
-                if definition_info["start_position"]:
-                    pos = definition_info["start_position"]
-                    definition_info["location_desc"] = f"Line {pos['line']} line, {pos['character']} column"
+                if start_position:
+                    location_desc = f"Line {start_position['line']} line, {start_position['character']} column"
                 else:
-                    definition_info["location_desc"] = "Unknown location"
-                
+                    location_desc = _UNKNOWN_LOCATION
+
                 # Generate file type information
-                file_path = definition_info["file_path"]
-                if file_path and file_path != "Unknown path":
-                    file_ext = Path(file_path).suffix.lower()
-                    lang_map = {
-                        ".py": "Python",
-                        ".js": "JavaScript",
-                        ".ts": "TypeScript",
-                        ".java": "Java",
-                        ".kt": "Kotlin",
-                        ".cs": "C#",
-                        ".cpp": "C++",
-                        ".c": "C",
-                        ".rs": "Rust",
-                        ".go": "Go",
-                        ".rb": "Ruby",
-                        ".dart": "Dart",
-                        ".sol": "Solidity",
-                        ".php": "PHP",
-                        ".swift": "Swift",
-                        ".scala": "Scala",
-                        ".r": "R",
-                        ".m": "Objective-C",
-                        ".mm": "Objective-C++"
-                    }
-                    definition_info["language"] = lang_map.get(file_ext, "Unknown language")
+                file_path = location.get("relativePath") or location.get("absolutePath", _UNKNOWN_PATH)
+                if file_path and file_path is not _UNKNOWN_PATH:
+                    _, dot, ext = file_path.rpartition('.')
+                    file_ext = ('.' + ext.lower()) if dot and '/' not in ext else ''
+                    language = _EXT_LANGUAGE_MAP.get(file_ext, _UNKNOWN_LANGUAGE)
                 else:
-                    definition_info["language"] = "Unknown language"
-                
+                    language = _UNKNOWN_LANGUAGE
+
+                # Build definition information in one go
+                definition_info = {
+                    "index": i + 1,
+                    "file_path": file_path,
+                    "absolute_path": location.get("absolutePath", ""),
+                    "relative_path": location.get("relativePath", ""),
+                    "uri": location.get("uri", ""),
+                    "range": range_info,
+                    "start_position": start_position,
+                    "end_position": end_position,
+                    "location_desc": location_desc,
+                    "language": language
+                }
+
                 definitions.append(definition_info)
                 
-            except Exception as e:
+            except (KeyError, TypeError, AttributeError, ValueError) as e:
                 logger.warning(f"Error parsing definition item {i}: {str(e)}")
                 continue
         
@@ -1114,7 +1160,7 @@ def format_lsp_definition_result(definitions: List[Dict[str, Any]]) -> str:
         lines.append(f"  File: {definition['file_path']}")
         lines.append(f"  Language: {definition['language']}")
         
-        if definition['location_desc'] != "Unknown location":
+        if definition['location_desc'] is not _UNKNOWN_LOCATION:
             lines.append(f"  Location: {definition['location_desc']}")
         
         if definition['relative_path'] and definition['relative_path'] != definition['file_path']:
@@ -1127,7 +1173,7 @@ def format_lsp_definition_result(definitions: List[Dict[str, Any]]) -> str:
         if definition['start_position'] and definition['end_position']:
             start = definition['start_position']
             end = definition['end_position']
-            if start != end:
+            if start['line'] != end['line'] or start['character'] != end['character']:
                 lines.append(f"  Range: From line {start['line']}, column {start['character']} to line {end['line']}, column {end['character']}")
     
     return "\n".join(lines)
\ No newline at end of file
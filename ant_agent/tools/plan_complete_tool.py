@@ -11,6 +11,9 @@ from ant_agent.tools.base import AntTool, AntToolResult
 from ant_agent.utils.plan_manager import plan_manager
 from pydantic import BaseModel, Field
 
+_NO_PLAN_MSG = "No plan remained. Call task_done tool to terminate the task."
+_ROLLBACK_MSG = "After finishing the current plan, let's roll back to the previously unfinished plan, the remaining steps of which are:\n"
+
 
 class PlanCompleteInput(BaseModel):
     pass
@@ -30,11 +33,11 @@ class PlanCompleteTool(AntTool):
         plan_manager.pop_plan()
         
         if not plan_manager.has_active_plans():
-            output = "No plan remained. Call task_done tool to terminate the task."
+            output = _NO_PLAN_MSG
         else:
             current_plan = plan_manager.get_current_plan()
             current_plan.removes_current_step()
-            output = "After finishing the current plan, let's roll back to the previously unfinished plan, the remaining steps of which are:\n" + '\n'.join(current_plan.steps)
+            output = _ROLLBACK_MSG + ('\n'.join(current_plan.steps) if current_plan.steps else "")
 
         return AntToolResult(
             success=True,
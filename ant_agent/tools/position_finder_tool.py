@@ -5,10 +5,15 @@
 
 from __future__ import annotations
 
-import re
-import ast
+import bisect
+import functools
 import logging
-from typing import Any, Dict, List, Optional, Type
+import operator
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar
+from array import array
+from collections import OrderedDict
+from itertools import accumulate, repeat
 from pathlib import Path
 
 from ant_agent.tools.base import AntTool, AntToolResult
@@ -18,6 +23,110 @@ from pydantic import BaseModel, Field
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1024)
+def _resolve_path(working_dir: str, file_path: str) -> str:
+    """Resolve file_path against working_dir unless it is already absolute."""
+    path = Path(file_path)
+    if path.is_absolute():
+        return str(path)
+    return str(Path(working_dir) / path)
+
+
+def _line_starts(lines: Sequence[str]) -> array:
+    """Get the offset at which each line starts, given the '\n'-separated lines of a file."""
+    # Running sum of len(line) + 1, evaluated entirely by C-level iterators into unboxed C integers
+    starts = array('q', accumulate(map(operator.add, map(len, lines), repeat(1)), initial=0))
+    starts.pop()
+    return starts
+
+
+# Hits this close to the suggested line are reported as ±3 range matches
+_NEAR_RANGE = 3
+
+
+class _FileContent(NamedTuple):
+    """Cached file content with its line index."""
+    content: str
+    lines: Tuple[str, ...]
+    line_starts: array
+
+
+_T = TypeVar('_T')
+
+
+# Total size of the files whose content (or per-file indexes) a _per_path_cache may hold
+_FILE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _per_path_cache(maxsize: int, max_bytes: int = _FILE_CACHE_MAX_BYTES) -> Callable[[Callable[..., _T]], Callable[..., _T]]:
+    """Cache func(path, mtime_ns, size, *args), keeping only the latest version of each path.
+
+    Only path and the (mtime_ns, size) version make up the key; any further arguments must be
+    determined by them (e.g. the content of that version) and are passed through on a miss.
+
+    An edit (new mtime_ns or size) replaces the path's entry instead of adding one next to it,
+    so stale versions of a file are never held. Least recently used paths are evicted past
+    maxsize entries or max_bytes of cached file size; a file larger than max_bytes is never cached.
+    """
+    def decorator(func: Callable[..., _T]) -> Callable[..., _T]:
+        entries: OrderedDict[str, Tuple[Tuple[int, int], _T]] = OrderedDict()
+        cached_bytes = 0
+
+        def evict(path: str) -> None:
+            nonlocal cached_bytes
+            (_, size), _ = entries.pop(path)
+            cached_bytes -= size
+
+        @functools.wraps(func)
+        def wrapper(path: str, mtime_ns: int, size: int, *args: Any) -> _T:
+            nonlocal cached_bytes
+            version = (mtime_ns, size)
+            entry = entries.get(path)
+            if entry is not None and entry[0] == version:
+                entries.move_to_end(path)
+                return entry[1]
+            # Release the old version before building the new one
+            if entry is not None:
+                evict(path)
+            value = func(path, mtime_ns, size, *args)
+            if size <= max_bytes:
+                entries[path] = (version, value)
+                cached_bytes += size
+                while len(entries) > maxsize or cached_bytes > max_bytes:
+                    evict(next(iter(entries)))
+            return value
+
+        def is_cached(path: str, mtime_ns: int, size: int) -> bool:
+            """Check whether this version of path is cached, without touching the LRU order."""
+            entry = entries.get(path)
+            return entry is not None and entry[0] == (mtime_ns, size)
+
+        def cache_clear() -> None:
+            nonlocal cached_bytes
+            entries.clear()
+            cached_bytes = 0
+
+        wrapper.is_cached = is_cached
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+@_per_path_cache(maxsize=64)
+def _load_file(path: str, mtime_ns: int, size: int) -> _FileContent:
+    """Read and index a file; the cached copy is replaced when mtime_ns or size changes."""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    lines = tuple(content.split('\n'))
+    return _FileContent(content, lines, _line_starts(lines))
+
+
+def _read_file(path: str) -> _FileContent:
+    """Get the content of a file, reusing the cached copy while it is unchanged on disk."""
+    st = os.stat(path)
+    return _load_file(path, st.st_mtime_ns, st.st_size)
+
+
 class PositionFinderInput(BaseModel):
     """Enhanced input schema for position finder tool with validation capabilities."""
     file_path: str = Field(description="Path to the source file")
@@ -72,11 +181,7 @@ class PositionFinderTool(AntTool):
 
     def _get_absolute_path(self, file_path: str) -> str:
         """Get absolute path for file, resolving relative paths against working directory."""
-        path = Path(file_path)
-        if path.is_absolute():
-            return str(path)
-        else:
-            return str(Path(self.working_dir) / path)
+        return _resolve_path(self.working_dir, file_path)
 
     def _run(self, file_path: str, line_number: int, line_content: str, target: str) -> AntToolResult:
         """Intelligent position finder with LLM suggestion validation and progressive search.
@@ -90,21 +195,21 @@ class PositionFinderTool(AntTool):
         Returns:
             Validated LSP-compatible coordinates or detailed error for bash fallback
         """
-        logger.info(f"PositionFinder: Starting validation for target '{target}' at line {line_number}")
-        logger.debug(f"File: {file_path}, Suggested line content: '{line_content}'")
+        logger.info("PositionFinder: Starting validation for target '%s' at line %s", target, line_number)
+        logger.debug("File: %s, Suggested line content: '%s'", file_path, line_content)
 
         try:
             # Resolve file path against working directory
             absolute_path = self._get_absolute_path(file_path)
-            logger.debug(f"Resolved absolute path: {absolute_path}")
+            logger.debug("Resolved absolute path: %s", absolute_path)
 
             # Read file content from file_path
             try:
-                with open(absolute_path, 'r', encoding='utf-8') as f:
-                    file_content = f.read()
-                logger.debug(f"Successfully read file content from {absolute_path}")
+                file_content = _read_file(absolute_path)
+                lines = file_content.lines
+                logger.debug("Successfully read file content from %s", absolute_path)
             except FileNotFoundError:
-                logger.error(f"File not found: {absolute_path}")
+                logger.error("File not found: %s", absolute_path)
                 return AntToolResult(
                     success=False,
                     error=f"File not found: {file_path}",
@@ -116,7 +221,7 @@ class PositionFinderTool(AntTool):
                     }
                 )
             except IOError as e:
-                logger.error(f"Error reading file {absolute_path}: {str(e)}")
+                logger.error("Error reading file %s: %s", absolute_path, e)
                 return AntToolResult(
                     success=False,
                     error=f"Error reading file {file_path}: {str(e)}",
@@ -129,13 +234,11 @@ class PositionFinderTool(AntTool):
                     }
                 )
 
-            # Parse file content into lines
-            lines = file_content.split('\n')
-            logger.debug(f"File has {len(lines)} total lines")
+            logger.debug("File has %s total lines", len(lines))
 
             # Validate line number is within bounds
             if line_number < 0 or line_number >= len(lines):
-                logger.warning(f"Invalid line number {line_number}. File has {len(lines)} lines (0-based)")
+                logger.warning("Invalid line number %s. File has %s lines (0-based)", line_number, len(lines))
                 return AntToolResult(
                     success=False,
                     error=f"Invalid line number {line_number}. File has {len(lines)} lines (0-based).",
@@ -149,60 +252,49 @@ class PositionFinderTool(AntTool):
                 )
 
             # Step 1: Validate LLM's suggested position
-            logger.info(f"Step 1: Validating LLM suggestion at line {line_number}")
+            logger.info("Step 1: Validating LLM suggestion at line %s", line_number)
             actual_line = lines[line_number].rstrip()  # Remove trailing whitespace
             suggested_line = line_content.rstrip()
 
-            logger.debug(f"Suggested line content: '{suggested_line}'")
-            logger.debug(f"Actual line content: '{actual_line}'")
+            logger.debug("Suggested line content: '%s'", suggested_line)
+            logger.debug("Actual line content: '%s'", actual_line)
 
             # Check if the suggested line content matches actual file content
             content_matches = self._lines_match(suggested_line, actual_line)
-            target_in_suggested_line = target in suggested_line
-            target_in_actual_line = target in actual_line
+            # One search serves both the Step 1 and Step 2 checks
+            char_idx = actual_line.find(target)
 
-            logger.debug(f"Content matches: {content_matches}")
-            logger.debug(f"Target in suggested line: {target_in_suggested_line}")
-            logger.debug(f"Target in actual line: {target_in_actual_line}")
+            logger.debug("Content matches: %s", content_matches)
+            logger.debug("Target in actual line: %s", char_idx != -1)
 
-            if content_matches and target_in_actual_line:
+            if content_matches and char_idx != -1:
                 # Perfect match! LLM's suggestion is correct
-                logger.info(f"✓ Perfect match found! LLM suggestion validated successfully")
-                char_idx = actual_line.find(target)
-                if char_idx != -1:
-                    return self._create_success_result(
-                        absolute_path, line_number, char_idx, actual_line, target,
-                        "exact_match", "LLM suggestion validated"
-                    )
+                logger.info("✓ Perfect match found! LLM suggestion validated successfully")
+                return self._create_success_result(
+                    absolute_path, line_number, char_idx, actual_line, target,
+                    "exact_match", "LLM suggestion validated"
+                )
 
             # Step 2: Progressive search if initial validation fails
-            logger.info(f"Step 2: Initial validation failed, starting progressive search")
-            if target_in_actual_line:
+            logger.info("Step 2: Initial validation failed, starting progressive search")
+            if char_idx != -1:
                 # Content doesn't match but target is in the actual line
-                logger.info(f"✓ Target found in actual line despite content mismatch")
-                char_idx = actual_line.find(target)
+                logger.info("✓ Target found in actual line despite content mismatch")
                 return self._create_success_result(
                     absolute_path, line_number, char_idx, actual_line, target,
                     "content_mismatch", "target_found_in_actual_line"
                 )
 
-            # Step 3: Search ±3 lines around the suggestion
-            logger.info(f"Step 3: Searching ±3 lines around line {line_number}")
-            result = self._search_in_range(lines, line_number, target, 3, absolute_path)
-            if result:
-                logger.info(f"✓ Target found within ±3 lines")
-                return result
-
-            # Step 4: Expand to ±5 lines if still not found
-            logger.info(f"Step 4: Expanding search to ±5 lines around line {line_number}")
-            result = self._search_in_range(lines, line_number, target, 5, absolute_path)
+            # Step 3: Search ±5 lines around the suggestion, nearest lines first
+            logger.info("Step 3: Searching ±5 lines around line %s", line_number)
+            result = self._search_in_range(file_content, line_number, target, 5, absolute_path)
             if result:
-                logger.info(f"✓ Target found within ±5 lines")
+                logger.info("✓ Target found within ±5 lines")
                 return result
 
-            # Step 5: Return detailed error for bash fallback
-            logger.warning(f"✗ Target '{target}' not found within ±5 lines of line {line_number}")
-            logger.info(f"Suggesting bash search as fallback")
+            # Step 4: Return detailed error for bash fallback
+            logger.warning("✗ Target '%s' not found within ±5 lines of line %s", target, line_number)
+            logger.info("Suggesting bash search as fallback")
             return AntToolResult(
                 success=False,
                 error=f"Target '{target}' not found within ±5 lines of suggested position (line {line_number}).",
@@ -218,7 +310,7 @@ class PositionFinderTool(AntTool):
             )
 
         except Exception as e:
-            logger.error(f"Position finder validation error: {str(e)}", exc_info=True)
+            logger.error("Position finder validation error: %s", e, exc_info=True)
             return AntToolResult(
                 output=f"Position finder validation error: {str(e)}",
                 success=False,
@@ -231,41 +323,69 @@ class PositionFinderTool(AntTool):
             )
 
     def _lines_match(self, line1: str, line2: str) -> bool:
-        """Check if two lines match, allowing for some whitespace differences."""
-        # Remove leading/trailing whitespace and compare
-        line1_stripped = line1.strip()
-        line2_stripped = line2.strip()
+        """Check if two lines match, allowing for some whitespace differences.
+
+        Both lines are expected to have their trailing whitespace removed already, as _run does.
+        """
+        # Remove leading whitespace and compare
+        line1_stripped = line1.lstrip()
+        line2_stripped = line2.lstrip()
         matches = line1_stripped == line2_stripped
-        logger.debug(f"Line comparison: '{line1_stripped}' vs '{line2_stripped}' -> {matches}")
+        logger.debug("Line comparison: '%s' vs '%s' -> %s", line1_stripped, line2_stripped, matches)
         return matches
 
-    def _search_in_range(self, lines: List[str], center_line: int, target: str, range_size: int, file_path: str) -> Optional[AntToolResult]:
-        """Search for target in a range around the center line."""
+    def _search_in_range(self, file_content: _FileContent, center_line: int, target: str, range_size: int, file_path: str) -> Optional[AntToolResult]:
+        """Search for target in a range around the center line, preferring the nearest line."""
+        content, lines, line_starts = file_content
         start = max(0, center_line - range_size)
         end = min(len(lines), center_line + range_size + 1)
 
-        logger.debug(f"Searching ±{range_size} lines around line {center_line} (range: {start}-{end-1})")
-
-        for i in range(start, end):
-            line_content = lines[i].rstrip()
-            if target in line_content:
-                char_idx = line_content.find(target)
-                logger.info(f"✓ Target found at line {i} (0-based) within ±{range_size} search")
-                logger.debug(f"Line {i} content: '{line_content}'")
-                return self._create_success_result(
-                    file_path, i, char_idx, line_content, target,
-                    f"range_search_±{range_size}", f"found_in_±{range_size}_lines"
-                )
-
-        logger.debug(f"Target not found in ±{range_size} lines search")
-        return None
+        logger.debug("Searching ±%s lines around line %s (range: %s-%s)", range_size, center_line, start, end - 1)
+
+        # One substring search over the whole window instead of one per line
+        endpos = line_starts[end] if end < len(lines) else len(content)
+        best = None
+        # Loop-invariant lookups bound once
+        find, bisect_right, target_len = content.find, bisect.bisect_right, len(target)
+        pos = find(target, line_starts[start], endpos)
+        while pos != -1:
+            i = bisect_right(line_starts, pos, start) - 1
+            char_idx = pos - line_starts[i]
+            # Occurrences must lie within the line, ignoring its trailing whitespace
+            if char_idx + target_len <= len(lines[i].rstrip()):
+                # Nearest line wins; on a tie the line below the suggestion comes first
+                key = (abs(i - center_line), i < center_line)
+                if best is None or key < best[0]:
+                    best = (key, i, char_idx)
+                if i >= center_line:
+                    break
+            # Only the first occurrence on a line can count (later ones end even further right),
+            # so continue from the next line
+            if i + 1 >= end:
+                break
+            pos = find(target, line_starts[i + 1], endpos)
+
+        if best is None:
+            logger.debug("Target not found in ±%s lines search", range_size)
+            return None
+
+        _, i, char_idx = best
+        line_content = lines[i].rstrip()
+        # Report the narrowest of the ±_NEAR_RANGE / ±range_size windows the hit falls in
+        found_range = _NEAR_RANGE if abs(i - center_line) <= _NEAR_RANGE else range_size
+        logger.info("✓ Target found at line %s (0-based) within ±%s search", i, found_range)
+        logger.debug("Line %s content: '%s'", i, line_content)
+        return self._create_success_result(
+            file_path, i, char_idx, line_content, target,
+            f"range_search_±{found_range}", f"found_in_±{found_range}_lines"
+        )
 
     def _create_success_result(self, file_path: str, line_number: int, char_idx: int,
                              line_content: str, target: str, match_type: str, 
                              validation_method: str) -> AntToolResult:
         """Create a success result with proper formatting."""
-        logger.info(f"Creating success result for target '{target}' at line {line_number}, char {char_idx}")
-        logger.debug(f"Match type: {match_type}, Validation: {validation_method}")
+        logger.info("Creating success result for target '%s' at line %s, char %s", target, line_number, char_idx)
+        logger.debug("Match type: %s, Validation: %s", match_type, validation_method)
 
         lsp_coordinates = {
             "file_path": file_path,
@@ -273,233 +393,45 @@ class PositionFinderTool(AntTool):
             "character": char_idx  # 0-based
         }
 
-        result_data = PositionFinderResult(
-            success=True,
-            positions=[{
-                "line_0_indexed": line_number,
-                "line_1_indexed": line_number + 1,
-                "character_0_indexed": char_idx,
-                "line_content": line_content.strip(),
-                "match_type": match_type,
-                "context": line_content.strip(),
-                "validation_method": validation_method
-            }],
-            best_match={
-                "line_0_indexed": line_number,
-                "line_1_indexed": line_number + 1,
-                "character_0_indexed": char_idx,
-                "line_content": line_content.strip(),
-                "match_type": match_type,
-                "context": line_content.strip(),
-                "validation_method": validation_method
-            },
-            lsp_coordinates=lsp_coordinates,
-            alternative_suggestions=[]
-        )
+        # The single match is both the only position and the best match; strip its line once
+        stripped_line = line_content.strip()
+        match = {
+            "line_0_indexed": line_number,
+            "line_1_indexed": line_number + 1,
+            "character_0_indexed": char_idx,
+            "line_content": stripped_line,
+            "match_type": match_type,
+            "context": stripped_line,
+            "validation_method": validation_method
+        }
 
-        output = f"Found '{target}' at line {line_number} (0-based): {line_content}, character {char_idx} (0-based)"
-        output += f"\nLSP coordinates: {lsp_coordinates}"
-        output += f"\nValidation: {validation_method}"
+        # Same shape as PositionFinderResult(...).dict(), built without a validation round trip
+        result_data = {
+            "success": True,
+            "positions": [match],
+            "best_match": match,
+            "alternative_suggestions": [],
+            "error_message": None,
+            "lsp_coordinates": lsp_coordinates
+        }
 
+        output = (f"Found '{target}' at line {line_number} (0-based): {line_content}, character {char_idx} (0-based)"
+                  f"\nLSP coordinates: {lsp_coordinates}"
+                  f"\nValidation: {validation_method}")
 
-        return AntToolResult(
+        # All fields are built here with the right types, so skip validation (and its copy of metadata)
+        return AntToolResult.model_construct(
             success=True,
             output=output,
-            metadata=result_data.dict()
+            metadata=result_data
         )
 
     def _find_positions(self, file_path: str, target: str, search_mode: str, target_type: str, context_line: Optional[int]) -> List[Dict[str, Any]]:
         """Find all positions of the target in file content."""
-        positions = []
+        from ant_agent.tools.position_search import find_positions
+        return find_positions(file_path, target, search_mode, target_type, context_line)
 
-        # Read file content from file_path
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            lines = content.split('\n')
-        except IOError as e:
-            logger.error(f"Error reading file {file_path} for position search: {str(e)}")
-            return positions
-
-        # Try different search strategies based on mode and target type
-        if search_mode == "exact":
-            positions = self._exact_search(lines, target, target_type)
-        elif search_mode == "fuzzy":
-            positions = self._fuzzy_search(lines, target, target_type)
-        elif search_mode == "definition":
-            positions = self._definition_search(lines, target, target_type)
-        elif search_mode == "reference":
-            positions = self._reference_search(lines, target, target_type)
-        else:
-            # Default to exact search
-            positions = self._exact_search(lines, target, target_type)
-
-        # If context line is provided, prioritize positions near that line
-        if context_line and positions:
-            positions = self._prioritize_by_context(positions, context_line)
-
-        return positions
-
-    def _exact_search(self, lines: List[str], target: str, target_type: str) -> List[Dict[str, Any]]:
-        """Exact string matching search."""
-        positions = []
-        for line_idx, line in enumerate(lines):
-            # Skip comments and strings for function/class definitions
-            if target_type in ["function", "class", "any"]:
-                stripped_line = line.strip()
-                if stripped_line.startswith('#') or stripped_line.startswith('"""'):
-                    continue
-
-            # Find all occurrences of target in this line
-            char_idx = line.find(target)
-            while char_idx != -1:
-                # Validate this is a valid occurrence (not part of another word)
-                if self._is_valid_occurrence(line, char_idx, len(target)):
-                    positions.append({
-                        "line_0_indexed": line_idx,
-                        "line_1_indexed": line_idx + 1,
-                        "character_0_indexed": char_idx,
-                        "line_content": line.strip(),
-                        "match_type": "exact",
-                        "context": self._get_context(lines, line_idx)
-                    })
-                char_idx = line.find(target, char_idx + 1)
-        return positions
-
-    def _fuzzy_search(self, lines: List[str], target: str, target_type: str) -> List[Dict[str, Any]]:
-        """Fuzzy matching for similar names."""
-        positions = []
-        target_lower = target.lower()
-
-        for line_idx, line in enumerate(lines):
-            line_lower = line.lower()
-            # Simple fuzzy matching - contains target as substring
-            char_idx = line_lower.find(target_lower)
-            while char_idx != -1:
-                positions.append({
-                    "line_0_indexed": line_idx,
-                    "line_1_indexed": line_idx + 1,
-                    "character_0_indexed": char_idx,
-                    "line_content": line.strip(),
-                    "match_type": "fuzzy",
-                    "context": self._get_context(lines, line_idx)
-                })
-                char_idx = line_lower.find(target_lower, char_idx + 1)
-        return positions
-
-    def _definition_search(self, lines: List[str], target: str, target_type: str) -> List[Dict[str, Any]]:
-        """Search for definitions (functions, classes, etc.)."""
-        positions = []
-
-        for line_idx, line in enumerate(lines):
-            stripped_line = line.strip()
-
-            # Look for function definitions
-            if target_type in ["function", "any"]:
-                if f"def {target}(" in stripped_line or f"def {target} (" in stripped_line:
-                    char_idx = line.find(f"def {target}")
-                    if char_idx != -1:
-                        positions.append({
-                            "line_0_indexed": line_idx,
-                            "line_1_indexed": line_idx + 1,
-                            "character_0_indexed": char_idx,
-                            "line_content": line.strip(),
-                            "match_type": "function_definition",
-                            "context": self._get_context(lines, line_idx)
-                        })
-
-            # Look for class definitions
-            if target_type in ["class", "any"]:
-                if f"class {target}(" in stripped_line or f"class {target}:" in stripped_line:
-                    char_idx = line.find(f"class {target}")
-                    if char_idx != -1:
-                        positions.append({
-                            "line_0_indexed": line_idx,
-                            "line_1_indexed": line_idx + 1,
-                            "character_0_indexed": char_idx,
-                            "line_content": line.strip(),
-                            "match_type": "class_definition",
-                            "context": self._get_context(lines, line_idx)
-                        })
-
-            # Look for variable assignments
-            if target_type in ["variable", "any"]:
-                if f"{target} =" in stripped_line or f"{target}:" in stripped_line:
-                    char_idx = line.find(target)
-                    if char_idx != -1:
-                        positions.append({
-                            "line_0_indexed": line_idx,
-                            "line_1_indexed": line_idx + 1,
-                            "character_0_indexed": char_idx,
-                            "line_content": line.strip(),
-                            "match_type": "variable_definition",
-                            "context": self._get_context(lines, line_idx)
-                        })
-
-        return positions
-
-    def _reference_search(self, lines: List[str], target: str, target_type: str) -> List[Dict[str, Any]]:
-        """Search for references/usage."""
-        positions = []
-
-        for line_idx, line in enumerate(lines):
-            # Skip definition lines
-            stripped_line = line.strip()
-            if stripped_line.startswith('def ') or stripped_line.startswith('class '):
-                continue
-
-            # Find usage of the target
-            char_idx = line.find(target)
-            while char_idx != -1:
-                if self._is_valid_occurrence(line, char_idx, len(target)):
-                    positions.append({
-                        "line_0_indexed": line_idx,
-                        "line_1_indexed": line_idx + 1,
-                        "character_0_indexed": char_idx,
-                        "line_content": line.strip(),
-                        "match_type": "reference",
-                        "context": self._get_context(lines, line_idx)
-                    })
-                char_idx = line.find(target, char_idx + 1)
-
-        return positions
-
-    def _is_valid_occurrence(self, line: str, start_idx: int, length: int) -> bool:
-        """Check if this is a valid word occurrence, not part of another word."""
-        # Check character before
-        if start_idx > 0:
-            prev_char = line[start_idx - 1]
-            if prev_char.isalnum() or prev_char == '_':
-                return False
-
-        # Check character after
-        if start_idx + length < len(line):
-            next_char = line[start_idx + length]
-            if next_char.isalnum() or next_char == '_':
-                return False
-
-        return True
-
-    def _get_context(self, lines: List[str], line_idx: int, context_size: int = 2) -> str:
-        """Get context around a line."""
-        start = max(0, line_idx - context_size)
-        end = min(len(lines), line_idx + context_size + 1)
-
-        context_lines = []
-        for i in range(start, end):
-            prefix = ">>> " if i == line_idx else "    "
-            context_lines.append(f"{prefix}{i+1}: {lines[i]}")
-
-        return "\n".join(context_lines)
-
-    def _prioritize_by_context(self, positions: List[Dict[str, Any]], context_line: int) -> List[Dict[str, Any]]:
-        """Prioritize positions based on proximity to context line."""
-        if not positions:
-            return positions
-
-        # Calculate distances and sort by proximity
-        for pos in positions:
-            distance = abs(pos["line_1_indexed"] - context_line)
-            pos["context_distance"] = distance
-
-        return sorted(positions, key=lambda x: x["context_distance"])
+    def _find_positions_batch(self, file_path: str, targets: List[str], target_type: str = "any") -> Dict[str, List[Dict[str, Any]]]:
+        """Find exact positions of several targets, reading the file once."""
+        from ant_agent.tools.position_search import find_positions_batch
+        return find_positions_batch(file_path, targets, target_type)
@@ -0,0 +1,589 @@
+# Copyright (c) Haoyang Ma
+# SPDX-License-Identifier: MIT
+
+"""Whole-file position search behind PositionFinderTool._find_positions.
+
+Imported lazily by the tool, so that the validation path of _run does not pay for it.
+"""
+
+from __future__ import annotations
+
+import ast
+import bisect
+import functools
+import io
+import logging
+import mmap
+import operator
+import os
+import re
+import sys
+import tokenize
+from array import array
+from itertools import repeat
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ant_agent.tools.position_finder_tool import _load_file, _per_path_cache
+
+# Set up module-level logger
+logger = logging.getLogger(__name__)
+
+# Definition match types accepted for each target_type
+_DEFINITION_MATCH_TYPES = {
+    "function": ("function_definition",),
+    "class": ("class_definition",),
+    "variable": ("variable_definition",),
+    "any": ("function_definition", "class_definition", "variable_definition"),
+}
+
+
+# Uncached files larger than this are probed with mmap before being decoded
+_MMAP_THRESHOLD = 64 * 1024
+
+# Before Python 3.12, tokenize returns a whole f-string as one STRING token, hiding the names in its fields
+_FSTRING_FIELDS_TOKENIZED = sys.version_info >= (3, 12)
+
+# Lines on either side of context_line searched before falling back to the whole file
+_CONTEXT_WINDOW = 20
+
+# Number of leading positions (after ranking) that get a context snippet
+_CONTEXT_TOP_K = 5
+
+# Match types of search hits, stored by index in _PositionArray.match_type
+_MATCH_TYPES = (
+    "exact",
+    "fuzzy",
+    "function_definition",
+    "class_definition",
+    "variable_definition",
+    "reference",
+)
+_MATCH_TYPE_IDS = {match_type: i for i, match_type in enumerate(_MATCH_TYPES)}
+
+
+class _PositionArray:
+    """Search hits stored column-wise; position dicts are only built when results are emitted."""
+
+    __slots__ = ("line", "col", "match_type")
+
+    def __init__(self):
+        self.line = array("i")  # 0-based line index
+        self.col = array("i")  # 0-based character index
+        self.match_type = array("B")  # index into _MATCH_TYPES
+
+    def __len__(self) -> int:
+        return len(self.line)
+
+    def append(self, line_idx: int, char_idx: int, match_type: str) -> None:
+        self.line.append(line_idx)
+        self.col.append(char_idx)
+        self.match_type.append(_MATCH_TYPE_IDS[match_type])
+
+
+@functools.lru_cache(maxsize=256)
+def _word_pattern(target: str) -> re.Pattern:
+    """Compile a pattern matching target only where it is not part of a longer identifier."""
+    return re.compile(r"(?<!\w)" + re.escape(target) + r"(?!\w)")
+
+
+@functools.lru_cache(maxsize=256)
+def _fuzzy_pattern(target: str) -> re.Pattern:
+    """Compile a case-insensitive pattern finding every (possibly overlapping) occurrence of target."""
+    return re.compile("(?=" + re.escape(target) + ")", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=256)
+def _definition_patterns(target: str) -> Tuple[Tuple[str, str, re.Pattern, str], ...]:
+    """Compile the line-based definition checks for target.
+
+    Each entry is (target_type, match_type, pattern, needle); a line defines target when the
+    pattern matches on it, and the first occurrence of needle in the line is the column.
+    """
+    escaped = re.escape(target)
+    return (
+        (
+            "function",
+            "function_definition",
+            re.compile("def " + escaped + r" ?\("),
+            f"def {target}",
+        ),
+        ("class", "class_definition", re.compile("class " + escaped + "[(:]"), f"class {target}"),
+        ("variable", "variable_definition", re.compile(escaped + "(?: =|:)"), target),
+    )
+
+
+def _file_may_contain(path: str, target: str) -> bool:
+    """Check whether target can occur in a file by scanning its raw bytes through mmap."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm.find(target.encode("utf-8")) != -1
+
+
+# Line prefixes of comments and docstrings, and of definitions
+_COMMENT_PREFIXES = ("#", '"""', "'''")
+_DEFINITION_PREFIXES = ("def ", "class ")
+
+
+def _is_comment_line(stripped_line: str) -> bool:
+    return stripped_line.startswith(_COMMENT_PREFIXES)
+
+
+def _is_definition_line(stripped_line: str) -> bool:
+    return stripped_line.startswith(_DEFINITION_PREFIXES)
+
+
+# Per-mode line filters for _scan; a line is skipped when its filter returns True
+_SCAN_FILTERS: Dict[str, Optional[Callable[[str], bool]]] = {
+    "exact": _is_comment_line,
+    "exact_all": None,
+    "fuzzy": None,
+    "reference": _is_definition_line,
+}
+
+
+def _scan(
+    content: str,
+    lines: Sequence[str],
+    line_starts: Sequence[int],
+    pattern: re.Pattern,
+    skip_line: Optional[Callable[[str], bool]] = None,
+    pos: int = 0,
+    endpos: Optional[int] = None,
+) -> Iterator[Tuple[int, int, str]]:
+    """Yield (line index, column, matched text) for every match of pattern in content[pos:endpos].
+
+    Matches on lines for which skip_line(line without leading whitespace) is true are left out.
+    """
+    # Matches arrive in offset order, so each bisect only needs to search from the previous line on
+    line_idx = 0
+    # skip_line is evaluated once per line, however many matches the line has
+    checked_line, skip = -1, False
+    for match in pattern.finditer(content, pos, len(content) if endpos is None else endpos):
+        start = match.start()
+        line_idx = bisect.bisect_right(line_starts, start, line_idx) - 1
+        if skip_line is not None:
+            if line_idx != checked_line:
+                checked_line, skip = line_idx, skip_line(lines[line_idx].lstrip())
+            if skip:
+                continue
+        yield line_idx, start - line_starts[line_idx], match.group()
+
+
+@_per_path_cache(maxsize=128)
+def _python_definition_index(
+    path: str, mtime_ns: int, size: int, content: str
+) -> Dict[str, List[Tuple[int, int, str]]]:
+    """Parse a Python file once and index its definitions by name.
+
+    The cached index is replaced when mtime_ns or size changes.
+    Maps each identifier to a sorted list of (0-based line, UTF-8 column offset, match_type).
+    """
+    tree = ast.parse(content, filename=path)
+
+    index: Dict[str, List[Tuple[int, int, str]]] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            name, line, col, match_type = (
+                node.name,
+                node.lineno,
+                node.col_offset,
+                "function_definition",
+            )
+        elif isinstance(node, ast.ClassDef):
+            name, line, col, match_type = (
+                node.name,
+                node.lineno,
+                node.col_offset,
+                "class_definition",
+            )
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            name, line, col, match_type = (
+                node.id,
+                node.lineno,
+                node.col_offset,
+                "variable_definition",
+            )
+        elif isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Store):
+            # Attribute assignments such as `self.name = ...`; point at the attribute name
+            name, line, col, match_type = (
+                node.attr,
+                node.end_lineno,
+                node.end_col_offset - len(node.attr),
+                "variable_definition",
+            )
+        else:
+            continue
+        index.setdefault(name, []).append((line - 1, col, match_type))
+
+    for entries in index.values():
+        entries.sort()
+    return index
+
+
+class _NameIndex(NamedTuple):
+    """NAME tokens of a Python file, with the lines the index cannot cover."""
+
+    names: Dict[str, List[Tuple[int, int]]]
+    fstring_lines: Tuple[int, ...]
+
+
+@_per_path_cache(maxsize=128)
+def _python_name_index(path: str, mtime_ns: int, size: int, content: str) -> _NameIndex:
+    """Tokenize a Python file once and index its NAME tokens.
+
+    The cached index is replaced when mtime_ns or size changes.
+    Comments and strings are single tokens, so names inside them are never indexed.
+    names maps each identifier to a list of (0-based line, column), in file order.
+
+    Before Python 3.12 an f-string is a single STRING token too, so the names in its
+    replacement fields are missing from names; the 0-based lines such f-strings span
+    are listed in fstring_lines (always empty on 3.12+), for callers to scan instead.
+    """
+    readline = io.StringIO(content).readline
+
+    index: Dict[str, List[Tuple[int, int]]] = {}
+    fstring_lines: List[int] = []
+    for token in tokenize.generate_tokens(readline):
+        if token.type == tokenize.NAME:
+            index.setdefault(token.string, []).append((token.start[0] - 1, token.start[1]))
+        elif token.type == tokenize.STRING and not _FSTRING_FIELDS_TOKENIZED:
+            text = token.string
+            # String prefix letters, e.g. "rf" in rf"..."
+            if "f" in text[: len(text) - len(text.lstrip("bBrRuUfF"))].lower():
+                first = token.start[0] - 1
+                if fstring_lines and fstring_lines[-1] >= first:
+                    first = fstring_lines[-1] + 1
+                fstring_lines.extend(range(first, token.end[0]))
+    return _NameIndex(index, tuple(fstring_lines))
+
+
+def find_positions(
+    file_path: str, target: str, search_mode: str, target_type: str, context_line: Optional[int]
+) -> List[Dict[str, Any]]:
+    """Find all positions of the target in file content."""
+    # Read file content from file_path
+    try:
+        st = os.stat(file_path)
+        # A large file that is not cached yet is probed as raw bytes first, so that it is never
+        # decoded when the target is absent; case-insensitive (fuzzy) searches cannot be probed
+        if (
+            search_mode != "fuzzy"
+            and st.st_size > _MMAP_THRESHOLD
+            and not _load_file.is_cached(file_path, st.st_mtime_ns, st.st_size)
+            and not _file_may_contain(file_path, target)
+        ):
+            return []
+        version = (st.st_mtime_ns, st.st_size)
+        content, lines, line_starts = _load_file(file_path, *version)
+    except IOError as e:
+        logger.error("Error reading file %s for position search: %s", file_path, e)
+        return []
+
+    # Try different search strategies based on mode and target type
+    if search_mode == "exact":
+        hits = _exact_search(content, lines, line_starts, target, target_type, file_path, version)
+    elif search_mode == "fuzzy":
+        hits = _fuzzy_search(content, lines, line_starts, target, target_type)
+    elif search_mode == "definition":
+        hits = None
+        if context_line:
+            # A definition near the context line is almost always the intended one
+            hits = _definition_search(
+                content,
+                lines,
+                line_starts,
+                target,
+                target_type,
+                file_path,
+                max(0, context_line - 1 - _CONTEXT_WINDOW),
+                context_line + _CONTEXT_WINDOW,
+                version,
+            )
+        if not hits:
+            hits = _definition_search(
+                content, lines, line_starts, target, target_type, file_path, version=version
+            )
+    elif search_mode == "reference":
+        hits = _reference_search(content, lines, line_starts, target, target_type)
+    else:
+        # Default to exact search
+        hits = _exact_search(content, lines, line_starts, target, target_type, file_path, version)
+
+    # If context line is provided, prioritize positions near that line
+    if context_line and hits:
+        return _emit_positions(
+            lines, hits, _prioritize_by_context(hits, context_line), context_line
+        )
+
+    return _emit_positions(lines, hits, range(len(hits)))
+
+
+def find_positions_batch(
+    file_path: str, targets: List[str], target_type: str = "any"
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Find exact positions of several targets, reading and indexing the file once.
+
+    Each target gets its own whole-word search over the shared content (a token index
+    lookup for Python identifiers), so the result for a target is the same as that of
+    find_positions in exact mode, even when targets overlap such as 'foo' and 'foo.bar'.
+    """
+    try:
+        st = os.stat(file_path)
+        version = (st.st_mtime_ns, st.st_size)
+        content, lines, line_starts = _load_file(file_path, *version)
+    except IOError as e:
+        logger.error("Error reading file %s for position search: %s", file_path, e)
+        return {target: [] for target in targets}
+
+    results = {}
+    for target in dict.fromkeys(targets):
+        hits = _exact_search(content, lines, line_starts, target, target_type, file_path, version)
+        results[target] = _emit_positions(lines, hits, range(len(hits)))
+    return results
+
+
+def _emit_positions(
+    lines: Sequence[str],
+    hits: _PositionArray,
+    order: Iterable[int],
+    context_line: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Build position dicts for the hits, in the given order.
+
+    Only the first _CONTEXT_TOP_K positions get a context snippet; the rest have context None.
+    """
+    positions = []
+    # Lines with several hits are stripped once and share the stripped string
+    stripped_lines: Dict[int, str] = {}
+    for rank, i in enumerate(order):
+        line_idx = hits.line[i]
+        stripped_line = stripped_lines.get(line_idx)
+        if stripped_line is None:
+            stripped_line = stripped_lines[line_idx] = lines[line_idx].strip()
+        position = {
+            "line_0_indexed": line_idx,
+            "line_1_indexed": line_idx + 1,
+            "character_0_indexed": hits.col[i],
+            "line_content": stripped_line,
+            "match_type": _MATCH_TYPES[hits.match_type[i]],
+            "context": _get_context(lines, line_idx) if rank < _CONTEXT_TOP_K else None,
+        }
+        if context_line:
+            position["context_distance"] = abs(line_idx + 1 - context_line)
+        positions.append(position)
+    return positions
+
+
+def _exact_search(
+    content: str,
+    lines: Sequence[str],
+    line_starts: Sequence[int],
+    target: str,
+    target_type: str,
+    file_path: Optional[str] = None,
+    version: Optional[Tuple[int, int]] = None,
+) -> _PositionArray:
+    """Exact string matching search.
+
+    version is the (mtime_ns, size) that content was loaded at; the token index is only
+    consulted when it is given, so the index always describes these very lines.
+    """
+    hits = _PositionArray()
+    skip_comments = target_type in ["function", "class", "any"]
+
+    # Skip comments and strings for function/class definitions
+    skip_line = _SCAN_FILTERS["exact" if skip_comments else "exact_all"]
+
+    # Python identifiers are looked up in the token index, which leaves out every comment and string
+    if (
+        skip_comments
+        and file_path
+        and version
+        and file_path.endswith(".py")
+        and target.isidentifier()
+    ):
+        index = _get_name_index(file_path, version, content)
+        if index is not None:
+            found = index.names.get(target, [])
+            if index.fstring_lines:
+                # Lines holding f-strings the tokenizer did not split are scanned like other files
+                fstring_lines = frozenset(index.fstring_lines)
+                found = [hit for hit in found if hit[0] not in fstring_lines]
+                pattern = _word_pattern(target)
+                for line_idx in index.fstring_lines:
+                    endpos = (
+                        line_starts[line_idx + 1] if line_idx + 1 < len(lines) else len(content)
+                    )
+                    found.extend(
+                        (hit_line, char_idx)
+                        for hit_line, char_idx, _ in _scan(
+                            content,
+                            lines,
+                            line_starts,
+                            pattern,
+                            skip_line,
+                            line_starts[line_idx],
+                            endpos,
+                        )
+                    )
+                found.sort()
+            for line_idx, char_idx in found:
+                hits.append(line_idx, char_idx, "exact")
+            return hits
+
+    # Whole-word occurrences across the file, mapped back to (line, column)
+    for line_idx, char_idx, _ in _scan(
+        content, lines, line_starts, _word_pattern(target), skip_line
+    ):
+        hits.append(line_idx, char_idx, "exact")
+    return hits
+
+
+def _fuzzy_search(
+    content: str, lines: Sequence[str], line_starts: Sequence[int], target: str, target_type: str
+) -> _PositionArray:
+    """Fuzzy matching for similar names."""
+    hits = _PositionArray()
+
+    # Simple fuzzy matching - case-insensitive substring, matched without lowercasing copies
+    for line_idx, char_idx, _ in _scan(
+        content, lines, line_starts, _fuzzy_pattern(target), _SCAN_FILTERS["fuzzy"]
+    ):
+        hits.append(line_idx, char_idx, "fuzzy")
+    return hits
+
+
+def _get_name_index(file_path: str, version: Tuple[int, int], content: str) -> Optional[_NameIndex]:
+    """Get the cached token index of content, None if it cannot be tokenized."""
+    try:
+        return _python_name_index(file_path, *version, content)
+    except (SyntaxError, ValueError, tokenize.TokenError) as e:
+        logger.debug("Falling back to pattern search for %s: %s", file_path, e)
+        return None
+
+
+def _get_definition_index(
+    file_path: str, version: Tuple[int, int], content: str
+) -> Optional[Dict[str, List[Tuple[int, int, str]]]]:
+    """Get the cached AST definition index of content, None if it cannot be parsed."""
+    try:
+        return _python_definition_index(file_path, *version, content)
+    except (SyntaxError, ValueError) as e:
+        logger.debug("Falling back to line scan for %s: %s", file_path, e)
+        return None
+
+
+def _definition_search(
+    content: str,
+    lines: Sequence[str],
+    line_starts: Sequence[int],
+    target: str,
+    target_type: str,
+    file_path: Optional[str] = None,
+    start: int = 0,
+    end: Optional[int] = None,
+    version: Optional[Tuple[int, int]] = None,
+) -> _PositionArray:
+    """Search for definitions (functions, classes, etc.) on lines[start:end].
+
+    The AST index is only used when version, the (mtime_ns, size) content was loaded at, is given.
+    """
+    if end is None:
+        end = len(lines)
+    hits = _PositionArray()
+
+    # Python files are searched through their AST, which skips strings and comments
+    index = (
+        _get_definition_index(file_path, version, content)
+        if file_path and version and file_path.endswith(".py")
+        else None
+    )
+    if index is not None:
+        match_types = _DEFINITION_MATCH_TYPES.get(target_type, ())
+        for line_idx, col, match_type in index.get(target, []):
+            if match_type not in match_types or not start <= line_idx < end:
+                continue
+            line = lines[line_idx]
+            # AST columns are UTF-8 byte offsets
+            char_idx = (
+                col
+                if line.isascii()
+                else len(line.encode("utf-8")[:col].decode("utf-8", "replace"))
+            )
+            # An async function's column is that of `async`; point at `def` as the line scan does
+            if match_type == "function_definition" and line.startswith("async", char_idx):
+                def_idx = line.find("def", char_idx + len("async"))
+                if def_idx != -1:
+                    char_idx = def_idx
+            hits.append(line_idx, char_idx, match_type)
+        return hits
+
+    pos = line_starts[start] if start < len(lines) else len(content)
+    endpos = line_starts[end] if end < len(lines) else len(content)
+    # Every definition pattern contains the target, so a range without it has no definitions
+    if content.find(target, pos, endpos) == -1:
+        return hits
+
+    # One pass per definition kind; the pattern finds the lines, the needle gives the column
+    found = []
+    for order, (kind, match_type, pattern, needle) in enumerate(_definition_patterns(target)):
+        if target_type not in (kind, "any"):
+            continue
+        last_line = -1
+        for line_idx, _, _ in _scan(content, lines, line_starts, pattern, pos=pos, endpos=endpos):
+            if line_idx != last_line:
+                last_line = line_idx
+                found.append((line_idx, order, lines[line_idx].find(needle), match_type))
+
+    # Line order, with function/class/variable order within a line
+    found.sort()
+    for line_idx, _, char_idx, match_type in found:
+        hits.append(line_idx, char_idx, match_type)
+
+    return hits
+
+
+def _reference_search(
+    content: str, lines: Sequence[str], line_starts: Sequence[int], target: str, target_type: str
+) -> _PositionArray:
+    """Search for references/usage."""
+    hits = _PositionArray()
+
+    # Whole-word occurrences outside definition lines, mapped back to (line, column)
+    for line_idx, char_idx, _ in _scan(
+        content, lines, line_starts, _word_pattern(target), _SCAN_FILTERS["reference"]
+    ):
+        hits.append(line_idx, char_idx, "reference")
+
+    return hits
+
+
+def _get_context(lines: Sequence[str], line_idx: int, context_size: int = 2) -> str:
+    """Get context around a line."""
+    start = max(0, line_idx - context_size)
+    end = min(len(lines), line_idx + context_size + 1)
+
+    # The target line is marked with '>>> ', its neighbours are indented to match
+    context_lines = [f"    {i + 1}: {line}" for i, line in enumerate(lines[start:line_idx], start)]
+    context_lines.append(f">>> {line_idx + 1}: {lines[line_idx]}")
+    context_lines.extend(
+        [f"    {i + 1}: {line}" for i, line in enumerate(lines[line_idx + 1 : end], line_idx + 1)]
+    )
+    return "\n".join(context_lines)
+
+
+def _prioritize_by_context(hits: _PositionArray, context_line: int) -> List[int]:
+    """Order hit indices by proximity to the context line."""
+    # |line_1_indexed - context_line| over the whole line column, without a Python-level loop
+    distances = array("i", map(abs, map(operator.sub, hits.line, repeat(context_line - 1))))
+    return sorted(range(len(distances)), key=distances.__getitem__)
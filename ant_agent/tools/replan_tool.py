@@ -8,9 +8,8 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional, Type
 
 from ant_agent.tools.base import AntTool, AntToolResult
-from ant_agent.utils.plan_manager import plan_manager
+from ant_agent.utils.plan_manager import plan_manager, strip_step_numbers
 from pydantic import BaseModel, Field
-import re
 
 class ReplanInput(BaseModel):
     """Input schema for sequential thinking tool."""
@@ -31,13 +30,8 @@ class ReplanTool(AntTool):
         super().__init__(**kwargs)
 
     def strip_step_numbers(self, steps: List[str]) -> List[str]:
-        """
-        去掉每条 step 前面的数字序号。
-        支持格式：1.  1)  (1)  1-  1–  1—  等，后面可跟空格或制表符。
-        返回新的 steps 列表，原列表不变。
-        """
-        pattern = re.compile(r'^\s*(?:\(\d+\)|\d+[\.\)\-–—]+)\s*')
-        return [pattern.sub('', s).strip() for s in steps]
+        """去掉每条 step 前面的数字序号，规则见 plan_manager.strip_step_numbers。"""
+        return strip_step_numbers(steps)
 
     def _run(self, steps: List[str]) -> AntToolResult:
         """Record a thought step."""
@@ -44,9 +44,9 @@ class StepCompleteTool(AntTool):
             current_plan = plan_manager
             output = "After completing this step, the current plan is complete too. Invoke plan_complete tool."
         else:
-            output = "After completing this step, there remains the following steps in the current plan:\n" 
-            for i, step in enumerate(current_plan.steps, 1):
-                output += f"{i}: {step}\n"
+            output = "After completing this step, there remains the following steps in the current plan:\n" + "".join(
+                f"{i}: {step}\n" for i, step in enumerate(current_plan.steps, 1)
+            )
 
         return AntToolResult(
             success=True,
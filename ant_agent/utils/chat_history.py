@@ -8,6 +8,9 @@ from langchain_core.prompts import ChatPromptTemplate
 from ant_agent.utils.streaming_trajectory_recorder import StreamingTrajectoryRecorder
 
 
+# Message types with a per-type position index in ChatHistory
+_INDEXED_MESSAGE_TYPES = (SystemMessage, HumanMessage, AIMessage, ToolMessage)
+
 # Global instances
 chat_history: Optional['ChatHistory'] = None
 
@@ -42,13 +45,43 @@ class ChatHistory:
             trajectory_recorder: Optional trajectory recorder for logging messages
         """
         self._messages: List[BaseMessage] = []
+        # Ascending positions in _messages of the messages of each indexed type
+        self._type_index: Dict[type, List[int]] = {message_type: [] for message_type in _INDEXED_MESSAGE_TYPES}
         self.trajectory_recorder = trajectory_recorder
 
     @property
     def messages(self) -> List[BaseMessage]:
-        """Get all messages in the conversation history."""
+        """Get all messages in the conversation history.
+
+        The list is shared; change it through ChatHistory's methods so the per-type index stays in sync.
+        """
         return self._messages
 
+    def _index_bucket(self, message: Any) -> Optional[List[int]]:
+        """Get the position list of the indexed type message belongs to, if any."""
+        bucket = self._type_index.get(type(message))
+        if bucket is None:
+            # Subclasses (e.g. AIMessageChunk) are indexed under their base message type
+            for message_type in _INDEXED_MESSAGE_TYPES:
+                if isinstance(message, message_type):
+                    return self._type_index[message_type]
+        return bucket
+
+    def _rebuild_type_index(self) -> None:
+        """Recompute the per-type index after messages were inserted, removed or reordered."""
+        for bucket in self._type_index.values():
+            bucket.clear()
+        for idx, msg in enumerate(self._messages):
+            bucket = self._index_bucket(msg)
+            if bucket is not None:
+                bucket.append(idx)
+
+    def _unindex_last(self, message: Any) -> None:
+        """Drop the index entry of message, which was just popped from the end of _messages."""
+        bucket = self._index_bucket(message)
+        if bucket:
+            bucket.pop()
+
     @property
     def count(self) -> int:
         """Get the number of messages."""
@@ -73,6 +106,9 @@ class ChatHistory:
         Args:
             message: The message to add
         """
+        bucket = self._index_bucket(message)
+        if bucket is not None:
+            bucket.append(len(self._messages))
         self._messages.append(message)
         if self.trajectory_recorder:
             self.trajectory_recorder.add_message(message)
@@ -128,6 +164,7 @@ class ChatHistory:
         """
         if 0 <= index <= len(self._messages):
             self._messages.insert(index, message)
+            self._rebuild_type_index()
             if self.trajectory_recorder:
                 self.trajectory_recorder.add_message(message)
 
@@ -169,7 +206,9 @@ class ChatHistory:
             The removed message, or None if index is out of bounds
         """
         if 0 <= index < len(self._messages):
-            return self._messages.pop(index)
+            message = self._messages.pop(index)
+            self._rebuild_type_index()
+            return message
         return None
 
     def remove_last_message(self) -> Optional[BaseMessage]:
@@ -179,7 +218,9 @@ class ChatHistory:
             The last message, or None if there are no messages
         """
         if self._messages:
-            return self._messages.pop()
+            message = self._messages.pop()
+            self._unindex_last(message)
+            return message
         return None
 
     def remove_last_n_messages(self, n: int) -> List[BaseMessage]:
@@ -193,16 +234,21 @@ class ChatHistory:
         """
         removed = []
         for _ in range(min(n, len(self._messages))):
-            removed.insert(0, self._messages.pop())
+            message = self._messages.pop()
+            self._unindex_last(message)
+            removed.insert(0, message)
         return removed
 
     def clear_all(self) -> None:
         """Clear all messages from the conversation history."""
         self._messages.clear()
+        for bucket in self._type_index.values():
+            bucket.clear()
 
     def clear_except_system(self) -> None:
         """Clear all messages except system messages."""
-        self._messages = [msg for msg in self._messages if isinstance(msg, SystemMessage)]
+        self._messages = self.get_message_by_type(SystemMessage)
+        self._rebuild_type_index()
 
     def clear_except_last_n(self, n: int) -> None:
         """Clear all messages except the last n messages.
@@ -212,6 +258,7 @@ class ChatHistory:
         """
         if len(self._messages) > n:
             self._messages = self._messages[-n:]
+            self._rebuild_type_index()
 
     def get_system_message(self) -> Optional[SystemMessage]:
         """Get the first system message in the history.
@@ -219,10 +266,8 @@ class ChatHistory:
         Returns:
             The first system message, or None if not found
         """
-        for msg in self._messages:
-            if isinstance(msg, SystemMessage):
-                return msg
-        return None
+        positions = self._type_index[SystemMessage]
+        return self._messages[positions[0]] if positions else None
 
     def get_last_message(self) -> Optional[BaseMessage]:
         """Get the last message in the history.
@@ -240,10 +285,8 @@ class ChatHistory:
         Returns:
             The last human message, or None if not found
         """
-        for msg in reversed(self._messages):
-            if isinstance(msg, HumanMessage):
-                return msg
-        return None
+        positions = self._type_index[HumanMessage]
+        return self._messages[positions[-1]] if positions else None
 
     def get_last_ai_message(self) -> Optional[AIMessage]:
         """Get the last AI message in the history.
@@ -251,10 +294,8 @@ class ChatHistory:
         Returns:
             The last AI message, or None if not found
         """
-        for msg in reversed(self._messages):
-            if isinstance(msg, AIMessage):
-                return msg
-        return None
+        positions = self._type_index[AIMessage]
+        return self._messages[positions[-1]] if positions else None
 
     def get_message_by_type(self, message_type: type) -> List[BaseMessage]:
         """Get all messages of a specific type.
@@ -265,7 +306,12 @@ class ChatHistory:
         Returns:
             List of messages of the specified type
         """
-        return [msg for msg in self._messages if isinstance(msg, message_type)]
+        positions = self._type_index.get(message_type)
+        if positions is None:
+            # Not one of the indexed types (e.g. BaseMessage or a subclass), so scan
+            return [msg for msg in self._messages if isinstance(msg, message_type)]
+        messages = self._messages
+        return [messages[i] for i in positions]
 
     def get_conversation_summary(self) -> Dict[str, Any]:
         """Get a summary of the conversation history.
@@ -274,10 +320,10 @@ class ChatHistory:
             Dictionary containing summary statistics
         """
         total_messages = len(self._messages)
-        system_messages = len(self.get_message_by_type(SystemMessage))
-        human_messages = len(self.get_message_by_type(HumanMessage))
-        ai_messages = len(self.get_message_by_type(AIMessage))
-        tool_messages = len(self.get_message_by_type(ToolMessage))
+        system_messages = len(self._type_index[SystemMessage])
+        human_messages = len(self._type_index[HumanMessage])
+        ai_messages = len(self._type_index[AIMessage])
+        tool_messages = len(self._type_index[ToolMessage])
 
         return {
             "total_messages": total_messages,
@@ -8,8 +8,28 @@ and generating context-aware continuation prompts.
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
 import json
+import re
 from datetime import datetime
 
+# Leading step numbers such as "1.", "1)", "(1)", "1-", "1–", "1—"
+_STEP_NUMBER_RE = re.compile(r'^\s*(?:\(\d+\)|\d+[\.\)\-–—]+)\s*')
+
+
+def strip_step_numbers(steps: List[str]) -> List[str]:
+    """
+    去掉每条 step 前面的数字序号。
+    支持格式：1.  1)  (1)  1-  1–  1—  等，后面可跟空格或制表符。
+    返回新的 steps 列表，原列表不变。
+    """
+    stripped_steps = []
+    for s in steps:
+        s = s.strip()
+        # 只有以数字或 "(" 开头的 step 才可能带序号，其余跳过正则
+        if s[:1].isdigit() or s.startswith('('):
+            s = _STEP_NUMBER_RE.sub('', s).strip()
+        stripped_steps.append(s)
+    return stripped_steps
+
 
 @dataclass
 class PlanNode: